@@ -0,0 +1 @@
+"""Casa IoT: simulación de sensores, envío a InfluxDB (core) y plano 2D (gui)."""
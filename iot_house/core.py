@@ -0,0 +1,468 @@
+"""Núcleo compartido de la casa IoT: configuración y envío de datos a InfluxDB
+y simulación de los sensores de cada habitación."""
+
+import atexit
+import math
+import random
+import os
+import socket
+import queue
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from urllib.parse import quote
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+# ==============================
+# Cargar configuración segura
+# ==============================
+load_dotenv()
+
+INFLUX_URL = os.getenv("INFLUX_URL")
+INFLUX_TOKEN = os.getenv("INFLUX_TOKEN")
+INFLUX_ORG = os.getenv("INFLUX_ORG")
+INFLUX_BUCKET = os.getenv("INFLUX_BUCKET")
+
+# Envío opcional por UDP (sin respuesta), p.ej. al listener UDP de InfluxDB 1.x
+# o de Telegraf. Si no se configura, se usa la API HTTP.
+INFLUX_UDP_HOST = os.getenv("INFLUX_UDP_HOST")
+INFLUX_UDP_PORT = os.getenv("INFLUX_UDP_PORT")
+
+
+def _parse_udp_port(value):
+    """
+    Puerto UDP de la configuración como entero, o None (con un aviso)
+    si no es un puerto válido.
+    """
+    try:
+        port = int(value)
+    except ValueError:
+        port = 0
+    if not 0 < port < 65536:
+        print(f"⚠️ INFLUX_UDP_PORT no válido ({value!r}): se usa la API HTTP")
+        return None
+    return port
+
+
+_UDP_TARGET = None
+_UDP_SOCK = None
+if INFLUX_UDP_HOST and INFLUX_UDP_PORT:
+    _udp_port = _parse_udp_port(INFLUX_UDP_PORT)
+    if _udp_port is not None:
+        _UDP_TARGET = (INFLUX_UDP_HOST, _udp_port)
+        _UDP_SOCK = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+# Sesión HTTP persistente: reutiliza la conexión TCP/TLS entre escrituras.
+# Solo escribe un hilo a la vez, así que basta con una conexión en el pool
+_ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+_SESSION = requests.Session()
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.headers.update({
+    "Authorization": f"Token {INFLUX_TOKEN}",
+    "Content-Type": "text/plain; charset=utf-8",
+})
+# Cierre de la conexión (y del socket UDP) al salir. El hilo de escritura
+# se para antes: su atexit se registra después y atexit va en orden inverso
+atexit.register(_SESSION.close)
+if _UDP_SOCK is not None:
+    atexit.register(_UDP_SOCK.close)
+
+# URL de escritura con la query ya codificada: org, bucket y precisión no cambian.
+# Una lectura cada 5 s, así que basta con precisión de segundos.
+_WRITE_URL = (
+    f"{INFLUX_URL}?org={quote(INFLUX_ORG or '', safe='')}"
+    f"&bucket={quote(INFLUX_BUCKET or '', safe='')}&precision=s"
+)
+
+# La configuración se comprueba una sola vez al importar: hace falta UDP o
+# todos los datos de la API HTTP
+_INFLUX_ENABLED = bool(
+    _UDP_SOCK is not None
+    or (INFLUX_URL and INFLUX_TOKEN and INFLUX_ORG and INFLUX_BUCKET)
+)
+
+
+def _line_template(measurement, field, value_format=".1f"):
+    """
+    Devuelve una función que genera la línea Line Protocol de una medida
+    con esquema fijo (tag room y un único campo), usando un solo f-string.
+    Las lecturas se guardan sin redondear: el valor se formatea aquí con
+    value_format (una décima por defecto).
+    """
+    prefix = f"{measurement},room="
+    field_eq = f" {field}="
+
+    def make_line(room, value, timestamp):
+        return f"{prefix}{room}{field_eq}{value:{value_format}} {timestamp}"
+
+    return make_line
+
+
+make_temp_line = _line_template("temperature", "value")
+make_lights_line = _line_template("lights", "state", "d")
+make_power_line = _line_template("power_usage", "value")
+make_water_line = _line_template("water_flow", "value")
+
+
+def write_batch_to_influx(lines):
+    """
+    Envía varias líneas Line Protocol a InfluxDB en una única petición
+    (un datagrama si está configurado UDP, un POST HTTP si no).
+    """
+    if not lines:
+        return
+
+    payload = "\n".join(lines).encode("utf-8")
+
+    if _UDP_SOCK is not None:
+        try:
+            _UDP_SOCK.sendto(payload, _UDP_TARGET)
+        except OSError as e:
+            print("⚠️ Error enviando a InfluxDB por UDP:", e)
+        return
+
+    try:
+        r = _SESSION.post(
+            _WRITE_URL,
+            data=payload,
+            timeout=5,
+        )
+        if r.status_code != 204:
+            print("⚠️ Error enviando a InfluxDB:", r.status_code, r.text)
+    except requests.exceptions.RequestException as e:
+        print("⚠️ Error de conexión a InfluxDB:", e)
+
+
+# Cola de escritura: la GUI deja los lotes y un hilo aparte los envía,
+# así el bucle de Tk nunca espera a la red
+_write_queue = queue.Queue(maxsize=32)
+
+
+def _influx_writer():
+    """
+    Consume los lotes de la cola y los envía a InfluxDB.
+    Si se han acumulado varios mientras se esperaba a la red,
+    se envían todos juntos en una sola petición.
+    Termina al recibir None (ver stop_influx_writer), después de enviar
+    lo que hubiera antes en la cola.
+    """
+    while True:
+        batch = _write_queue.get()
+        stop = batch is None
+        lines = [] if stop else list(batch)
+        taken = 1
+        while not stop:
+            try:
+                batch = _write_queue.get_nowait()
+            except queue.Empty:
+                break
+            taken += 1
+            if batch is None:
+                stop = True
+            else:
+                lines.extend(batch)
+
+        write_batch_to_influx(lines)
+        for _ in range(taken):
+            _write_queue.task_done()
+        if stop:
+            return
+
+
+def submit_to_influx(lines):
+    """
+    Encola un lote para InfluxDB sin bloquear.
+    Si la cola está llena se descarta el lote más antiguo.
+    """
+    try:
+        _write_queue.put_nowait(lines)
+    except queue.Full:
+        try:
+            _write_queue.get_nowait()
+            _write_queue.task_done()
+        except queue.Empty:
+            pass
+        _write_queue.put_nowait(lines)
+
+
+def _discard(lines):
+    """
+    Sustituye a submit_to_influx y write_batch_to_influx cuando InfluxDB
+    no está configurado.
+    """
+
+
+# Hilo de escritura: no se lanza al importar, sino desde la GUI
+_writer_thread = None
+
+
+def start_influx_writer():
+    """
+    Arranca (una sola vez) el hilo que envía los lotes de submit_to_influx.
+    Sin configuración de InfluxDB no hace nada.
+    """
+    global _writer_thread
+    if not _INFLUX_ENABLED or _writer_thread is not None:
+        return
+    _writer_thread = threading.Thread(target=_influx_writer, name="influx-writer", daemon=True)
+    _writer_thread.start()
+    atexit.register(stop_influx_writer)
+
+
+def stop_influx_writer(timeout=5):
+    """
+    Envía lo que quede en la cola y para el hilo de escritura, esperando
+    como mucho timeout segundos. Se llama sola al salir del programa.
+    """
+    global _writer_thread
+    thread, _writer_thread = _writer_thread, None
+    if thread is None:
+        return
+    try:
+        _write_queue.put(None, timeout=timeout)
+    except queue.Full:
+        pass
+    thread.join(timeout)
+    if thread.is_alive():
+        print("⚠️ InfluxDB no ha respondido a tiempo: se pierden las lecturas pendientes")
+
+
+# Sin configuración de InfluxDB, el envío (encolado o directo) no hace nada
+if not _INFLUX_ENABLED:
+    submit_to_influx = _discard
+    write_batch_to_influx = _discard
+
+
+# ==============================
+# Simulación de la casa IoT
+# ==============================
+
+ROOMS = ["salon", "dormitorio", "cocina", "bano"]
+
+
+@dataclass(slots=True)
+class Reading:
+    """
+    Lectura de los sensores de una habitación en un instante
+    (timestamp en segundos Unix, el mismo que se envía a InfluxDB).
+    """
+    timestamp: int
+    room: str
+    temperature: float
+    lights_on: int
+    power_usage: float
+    water_flow: float
+
+
+# Generador propio de la simulación, independiente del estado global de random
+_RNG = random.Random()
+# Método ligado una sola vez: cada muestra es una llamada directa en C
+_random = _RNG.random
+
+# Frecuencia angular del ciclo diario de temperatura (rad/h)
+_TEMP_OMEGA = 2 * math.pi / 24
+
+# Consumo base (W) de cada habitación
+_BASE_POWER = {
+    "salon": 60,
+    "dormitorio": 20,
+    "cocina": 80,
+    "bano": 10,
+}
+
+# Picos puntuales de consumo: (probabilidad por lectura, picos posibles en W)
+_POWER_PEAKS = {
+    "cocina": (0.1, (500, 800, 1200)),
+    "bano": (0.05, (600, 900)),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class HouseModel:
+    """
+    Datos del modelo de temperatura y de agua, lo único en que se diferencian
+    el plano 2D y el simulador de terminal (luces y consumo son comunes).
+    """
+    # Offset de temperatura (ºC) de cada habitación
+    temp_offset: dict
+    # Amplitud (ºC) del ciclo diario de temperatura alrededor de 20 ºC
+    temp_amplitude: float
+    # Uso de agua con caudal continuo: (probabilidad por lectura, mínimo, máximo) en L/min
+    water_range: dict = field(default_factory=dict)
+    # Uso de agua con caudales discretos: (probabilidad por lectura, caudales posibles)
+    water_levels: dict = field(default_factory=dict)
+
+
+# Modelo del plano 2D. Probabilidades de agua altas para que se vea en la interfaz.
+GUI_MODEL = HouseModel(
+    temp_offset={
+        "salon": 1.0,
+        "dormitorio": -0.5,
+        "cocina": 1.5,
+        "bano": 0.0,
+    },
+    temp_amplitude=4,
+    water_range={
+        "cocina": (0.4, 2, 8),
+        "bano": (0.5, 3, 12),
+    },
+)
+
+# Modelo del simulador de terminal: agua en todas las habitaciones,
+# con uno de unos caudales fijos
+TERMINAL_MODEL = HouseModel(
+    temp_offset={
+        "salon": -1.5,
+        "dormitorio": 1.5,
+        "cocina": 3.5,
+        "bano": -4.5,
+    },
+    temp_amplitude=2,
+    water_levels={
+        room: (0.5, (0.0, 1.5, 2.4, 3.7, 5.0, 7.3, 8.8, 10.1, 11.6))
+        for room in ROOMS
+    },
+)
+
+
+def _pick(values, x):
+    """
+    Elige un elemento de values a partir de x uniforme en [0, 1).
+    """
+    return values[min(int(x * len(values)), len(values) - 1)]
+
+
+def simulate_temperature(room, base_daily, model=GUI_MODEL):
+    """
+    Simula la temperatura de una habitación a partir de la base diaria
+    (común a toda la casa) más el offset de la habitación y algo de ruido.
+    """
+    room_offset = model.temp_offset.get(room, 0.0)
+    # Uniforme en [-0.5, 0.5) sin pasar por Random.uniform (escrito en Python)
+    noise = _random() - 0.5
+    return base_daily + room_offset + noise
+
+
+def lights_probability(hour):
+    """
+    Probabilidad de que una luz esté encendida según la hora del día.
+    Es la misma para todas las habitaciones, así que se calcula una vez por lectura.
+    """
+    if 8 <= hour < 18:
+        return 0.15
+    if 18 <= hour < 23:
+        return 0.7
+    return 0.3
+
+
+def simulate_lights(_, prob_on):
+    """
+    Simula si las luces están encendidas o apagadas con la probabilidad de la hora actual.
+    """
+    return 1 if _random() < prob_on else 0
+
+
+def simulate_power_usage(room, lights_on):
+    """
+    Simula el consumo de energía en función de la habitación y si las luces están encendidas.
+    """
+    base_power = _BASE_POWER.get(room, 20)
+
+    lights_power = 10 if lights_on else 0
+
+    peak_power = 0
+    peak = _POWER_PEAKS.get(room)
+    if peak is not None:
+        prob, peaks = peak
+        u = _random()
+        if u < prob:
+            # Sabiendo que u < prob, u / prob es uniforme en [0, 1): la misma
+            # extracción sirve para elegir el pico
+            peak_power = _pick(peaks, u / prob)
+
+    return base_power + lights_power + peak_power
+
+
+def simulate_water_flow(room, model=GUI_MODEL):
+    """
+    Simula el flujo de agua en función de la habitación.
+    """
+    water = model.water_range.get(room)
+    if water is not None:
+        prob, low, high = water
+        u = _random()
+        if u < prob:
+            # Igual que en los picos de consumo: u / prob da el caudal
+            return low + (high - low) * (u / prob)
+        return 0.0
+
+    water = model.water_levels.get(room)
+    if water is not None:
+        prob, levels = water
+        u = _random()
+        if u < prob:
+            return _pick(levels, u / prob)
+    return 0.0
+
+
+def simulate_house_once(model=GUI_MODEL):
+    """
+    Simula una lectura de sensores en todas las habitaciones de la casa.
+    """
+    now = datetime.now()
+    hour = now.hour + now.minute / 60.0
+
+    # Invariantes de la lectura: iguales para todas las habitaciones
+    timestamp = int(now.timestamp())
+    prob_on = lights_probability(hour)
+    base_daily = 20 + model.temp_amplitude * math.sin(_TEMP_OMEGA * (hour - 14))
+
+    readings = []
+
+    for room in ROOMS:
+        temp = simulate_temperature(room, base_daily, model)
+        lights_on = simulate_lights(room, prob_on)
+        power = simulate_power_usage(room, lights_on)
+        water = simulate_water_flow(room, model)
+
+        readings.append(Reading(
+            timestamp=timestamp,
+            room=room,
+            temperature=temp,
+            lights_on=lights_on,
+            power_usage=power,
+            water_flow=water,
+        ))
+
+    return readings
+
+
+def format_readings(readings):
+    """
+    Convierte las lecturas de un ciclo en el texto para la terminal
+    (separador y una línea por habitación) y las líneas Line Protocol.
+    """
+    # Todas las lecturas del ciclo comparten timestamp (segundos Unix, el que
+    # va a InfluxDB en un solo POST); para la terminal se formatea una vez
+    timestamp = readings[0].timestamp
+    log_prefix = f"[{datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')}] room="
+    lines = []
+
+    log_lines = ["-" * 80]
+    for r in readings:
+        log_lines.append(
+            f"{log_prefix}{r.room}, "
+            f"temp={r.temperature:.1f}°C, lights_on={r.lights_on}, "
+            f"power={r.power_usage:.0f}W, water={r.water_flow:.1f} L/min"
+        )
+
+        room = r.room
+        lines.append(make_temp_line(room, r.temperature, timestamp))
+        lines.append(make_lights_line(room, r.lights_on, timestamp))
+        lines.append(make_power_line(room, r.power_usage, timestamp))
+        lines.append(make_water_line(room, r.water_flow, timestamp))
+
+    return "\n".join(log_lines) + "\n", lines
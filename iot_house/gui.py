@@ -0,0 +1,684 @@
+"""Plano 2D de la casa IoT en Tkinter: el plano básico, que muestra la
+simulación automática, y la versión interactiva con controles manuales."""
+
+import sys
+import threading
+import time
+from datetime import datetime
+
+import tkinter as tk
+from tkinter import font as tkfont
+
+from .core import (
+    ROOMS,
+    Reading,
+    format_readings,
+    simulate_house_once,
+    start_influx_writer,
+    submit_to_influx,
+)
+
+
+# ==============================
+# GUI: Plano 2D de la casa
+# ==============================
+
+# Definimos un plano 2x2 continuo:
+#  -----------------------------------------
+# |                |                       |
+# |     SALÓN      |        COCINA         |
+# |                |                       |
+# |----------------+-----------------------|
+# |                |                       |
+# |  DORMITORIO    |         BAÑO          |
+# |                |                       |
+#  -----------------------------------------
+HOUSE_BOUNDS = (80, 80, 760, 560)  # borde exterior de la casa
+
+# Cadencia de repintado del plano (ms), independiente de la de simulación
+RENDER_INTERVAL_MS = 33
+
+x1_house, y1_house, x2_house, y2_house = HOUSE_BOUNDS
+mid_x = (x1_house + x2_house) // 2
+mid_y = (y1_house + y2_house) // 2
+
+ROOM_LAYOUT = {
+    "salon":      (x1_house, y1_house, mid_x,   mid_y),
+    "cocina":     (mid_x,    y1_house, x2_house, mid_y),
+    "dormitorio": (x1_house, mid_y,    mid_x,   y2_house),
+    "bano":       (mid_x,    mid_y,    x2_house, y2_house),
+}
+
+ROOM_LABELS = {
+    "salon": "Salón",
+    "dormitorio": "Dormitorio",
+    "cocina": "Cocina",
+    "bano": "Baño",
+}
+
+# Etiqueta de cada habitación con el valor por defecto ya resuelto
+_ROOM_LABEL = {room: ROOM_LABELS.get(room, room.capitalize()) for room in ROOMS}
+
+
+def _color_for_decidegrees(q):
+    """
+    Color de fondo para una temperatura expresada en décimas de grado.
+    """
+    t_min, t_max = 15.0, 30.0
+    # Normalizamos entre 0 y 1
+    n = (q / 10 - t_min) / (t_max - t_min)
+    n = max(0.0, min(1.0, n))
+    # Interpolamos entre azul (0) y rojo (1)
+    r = int(255 * n)
+    g = int(80 * (1 - n) + 80 * n)  # un poco de verde para suavizar
+    b = int(255 * (1 - n))
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+# Tabla de colores precalculada: una entrada por décima de grado en [15, 30] ºC
+_TEMP_COLORS = tuple(_color_for_decidegrees(q) for q in range(150, 301))
+
+
+def temperature_to_color(temp):
+    """
+    Convierte una temperatura aprox. [15, 30] ºC en un color de fondo.
+    Azul = frío, rojo = caliente.
+    La temperatura se redondea a décimas de grado y se busca en _TEMP_COLORS.
+    """
+    idx = int(round(temp * 10)) - 150
+    if idx <= 0:
+        return _TEMP_COLORS[0]
+    if idx >= 150:
+        return _TEMP_COLORS[150]
+    return _TEMP_COLORS[idx]
+
+
+class HouseGUI:
+    def __init__(self, update_interval_ms=5000):
+        self.update_interval_ms = update_interval_ms
+
+        self.root = tk.Tk()
+        self.root.title("Simulación Casa IoT - Plano 2D")
+
+        self.font_title = tkfont.Font(family="Helvetica", size=16, weight="bold")
+        self.font_info = tkfont.Font(family="Helvetica", size=11)
+
+        # Diccionarios para acceder rápidamente a los elementos del canvas
+        self.room_rects = {}
+        self.room_texts = {}
+        # Tag propio de cada rectángulo, para agrupar varios en una sola llamada
+        self._rect_tags = {}
+        # Último valor aplicado a cada elemento del canvas:
+        # (relleno, borde) para los rectángulos y el texto para las etiquetas
+        self._last_state = {}
+
+        # Ventana, plano y (en la versión interactiva) panel de control
+        self._build_window()
+        self._draw_house_layout()
+        self._build_control_panel()
+
+        # Hilo que envía las lecturas a InfluxDB sin bloquear la GUI
+        start_influx_writer()
+
+        # La simulación corre en su propio hilo y deja aquí las últimas
+        # lecturas; el bucle de Tk solo las recoge y repinta
+        self._latest = None
+        self._latest_lock = threading.Lock()
+        # Se incrementa cuando las lecturas en curso dejan de valer
+        # (p. ej. al cambiar de modo) para descartarlas al repintar
+        self._render_epoch = 0
+        self._stop = threading.Event()
+        # Como mucho un repintado pendiente por ciclo de reposo de Tk
+        self._render_pending = False
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        threading.Thread(
+            target=self._simulation_loop, name="house-sim", daemon=True
+        ).start()
+        self.root.after(RENDER_INTERVAL_MS, self._render_tick)
+
+    def _build_window(self):
+        """
+        Crea el canvas del plano ocupando toda la ventana.
+        """
+        self.canvas = tk.Canvas(self.root, width=900, height=650, bg="white")
+        self.canvas.pack(fill="both", expand=True)
+
+    def _draw_house_layout(self):
+        """
+        Dibuja las paredes de la casa y las habitaciones como un plano continuo.
+        """
+        # Título
+        self.canvas.create_text(
+            450, 30,
+            text="Plano 2D - Casa IoT",
+            font=self.font_title
+        )
+
+        # Borde exterior de la casa (pared exterior más gruesa)
+        x1, y1, x2, y2 = HOUSE_BOUNDS
+        self.canvas.create_rectangle(
+            x1, y1, x2, y2,
+            outline="black",
+            width=5
+        )
+
+        # Paredes interiores (división 2x2)
+        # Pared vertical central
+        self.canvas.create_line(
+            mid_x, y1, mid_x, y2,
+            fill="black",
+            width=3
+        )
+        # Pared horizontal central
+        self.canvas.create_line(
+            x1, mid_y, x2, mid_y,
+            fill="black",
+            width=3
+        )
+
+        # Dibujo de habitaciones (rectángulos coloreables encima del plano)
+        for room, (rx1, ry1, rx2, ry2) in ROOM_LAYOUT.items():
+            # Rectángulo para el color de temperatura + borde para "luces"
+            rect = self.canvas.create_rectangle(
+                rx1 + 3, ry1 + 3, rx2 - 3, ry2 - 3,
+                fill="#d9eaf7",
+                outline="black",
+                width=2,
+                tags=("room_rect", f"room_rect_{room}")
+            )
+
+            # Texto centrado dentro de la habitación
+            cx = (rx1 + rx2) / 2
+            cy = (ry1 + ry2) / 2
+            label = _ROOM_LABEL[room]
+            text_id = self.canvas.create_text(
+                cx, cy,
+                text=f"{label}\n\n(esperando datos...)",
+                font=self.font_info,
+                justify="center"
+            )
+
+            self.room_rects[room] = rect
+            self._rect_tags[rect] = f"room_rect_{room}"
+            self.room_texts[room] = text_id
+
+    def _build_control_panel(self):
+        """
+        El plano básico no tiene panel de control.
+        """
+
+    def _simulation_loop(self):
+        """
+        Hilo de simulación: ejecuta update_simulation cada update_interval_ms
+        sobre un reloj monotónico, de modo que lo que tarde cada ciclo no
+        retrasa los siguientes.
+        """
+        interval = self.update_interval_ms / 1000
+        next_tick = time.monotonic() + 0.2
+        while not self._stop.wait(max(0.0, next_tick - time.monotonic())):
+            self.update_simulation()
+            # Si un ciclo se ha retrasado más de un intervalo no se intenta recuperar
+            next_tick = max(next_tick + interval, time.monotonic())
+
+    def _render_tick(self):
+        """
+        Comprueba si el hilo de simulación ha publicado lecturas nuevas
+        y, si es así, pide un repintado. Se reprograma cada RENDER_INTERVAL_MS.
+        """
+        if self._latest is not None:
+            self._schedule_render()
+        self.root.after(RENDER_INTERVAL_MS, self._render_tick)
+
+    def _schedule_render(self):
+        """
+        Programa un repintado en el próximo momento de reposo de Tk.
+        Las peticiones que lleguen antes se agrupan en ese mismo repintado.
+        """
+        if not self._render_pending:
+            self._render_pending = True
+            self.root.after_idle(self._do_render)
+
+    def _do_render(self):
+        """
+        Aplica en una sola pasada todo lo pendiente de pintar.
+        """
+        self._render_pending = False
+        visuals = self._collect_visuals()
+        self._apply_visuals([v for v in visuals.values() if v is not None])
+
+    def _collect_visuals(self):
+        """
+        Devuelve, por habitación, el aspecto pendiente de pintar (las tuplas
+        de _room_visual) a partir de las últimas lecturas publicadas.
+        """
+        visuals = {}
+        with self._latest_lock:
+            latest, self._latest = self._latest, None
+        # Se descartan lecturas generadas antes del último cambio de modo
+        if latest is not None and latest[0] == self._render_epoch:
+            for r in latest[1]:
+                visuals[r.room] = self._room_visual(r)
+        return visuals
+
+    def _on_close(self):
+        self._stop.set()
+        self.root.destroy()
+
+    def _simulate(self):
+        """
+        Lecturas de un ciclo: en el plano básico, siempre la simulación automática.
+        """
+        return simulate_house_once()
+
+    def update_simulation(self):
+        """
+        Obtiene las lecturas del ciclo (_simulate), las envía a InfluxDB
+        y las publica para el siguiente repintado.
+        Se ejecuta en el hilo de simulación: no toca ningún widget de Tk.
+        """
+        epoch = self._render_epoch
+        readings = self._simulate()
+
+        # Salida por terminal en una sola escritura
+        log_text, lines = format_readings(readings)
+        sys.stdout.write(log_text)
+
+        # Enviar a InfluxDB (si está configurado) desde el hilo de escritura
+        submit_to_influx(lines)
+
+        # El hilo de Tk recoge las lecturas en su próximo _render_tick
+        with self._latest_lock:
+            self._latest = (epoch, readings)
+
+    def _room_visual(self, reading):
+        """
+        Calcula el color, el borde y el texto de una habitación concreta.
+        Devuelve la tupla que consume _apply_visuals (o None si la
+        habitación no está en el plano).
+        """
+        room = reading.room
+        if room not in self.room_rects:
+            return None
+
+        rect_id = self.room_rects[room]
+        text_id = self.room_texts[room]
+
+        # Color según temperatura
+        fill_color = temperature_to_color(reading.temperature)
+        # Borde amarillo si la luz está encendida
+        outline_color = "gold" if reading.lights_on else "black"
+
+        label = _ROOM_LABEL[room]
+        lights_str = "ON" if reading.lights_on else "OFF"
+        lights_icon = "💡" if reading.lights_on else "💤"
+
+        text = (
+            f"{label} {lights_icon}\n\n"
+            f"T: {reading.temperature:.1f} °C\n"
+            f"Luz: {lights_str}\n"
+            f"Potencia: {reading.power_usage:.0f} W\n"
+            f"Agua: {reading.water_flow:.1f} L/min"
+        )
+        return rect_id, fill_color, outline_color, text_id, text
+
+    def _apply_visuals(self, pending):
+        """
+        Aplica sobre el canvas los cambios calculados por _room_visual,
+        omitiendo los elementos cuyo valor no ha cambiado.
+        """
+        # Rectángulos a actualizar agrupados por (relleno, borde)
+        rect_groups = {}
+        for rect_id, fill_color, outline_color, text_id, text in pending:
+            # Solo se tocan los elementos cuyo valor ha cambiado: el texto cambia
+            # casi siempre, pero el color del rectángulo a menudo no
+            if self._last_state.get(text_id) != text:
+                self._last_state[text_id] = text
+                self.canvas.itemconfig(text_id, text=text)
+
+            style = (fill_color, outline_color)
+            if self._last_state.get(rect_id) != style:
+                self._last_state[rect_id] = style
+                rect_groups.setdefault(style, []).append(rect_id)
+
+        # Una sola llamada a Tcl por aspecto: el tag común si son todas las
+        # habitaciones, o una expresión de tags ("a||b") si son varias
+        for (fill_color, outline_color), rect_ids in rect_groups.items():
+            if len(rect_ids) == len(self.room_rects):
+                target = "room_rect"
+            elif len(rect_ids) == 1:
+                target = rect_ids[0]
+            else:
+                target = "||".join(self._rect_tags[rect_id] for rect_id in rect_ids)
+            self.canvas.itemconfigure(target, fill=fill_color, outline=outline_color)
+
+    def run(self):
+        self.root.mainloop()
+
+
+class InteractiveHouseGUI(HouseGUI):
+    """
+    Plano 2D con panel de control: permite cambiar a modo manual y fijar
+    desde la interfaz los valores de cada habitación.
+    """
+
+    def __init__(self, update_interval_ms=5000):
+        # Copia del modo y de los valores manuales en objetos de Python para
+        # el hilo de simulación, que no puede leer variables de Tk
+        self._manual_mode = False
+        self._manual_values = {}
+        # Habitaciones a repintar desde los controles manuales
+        self._dirty_manual = set()
+
+        # Variables de control manual por habitación
+        self.manual_temperature = {}
+        self.manual_lights = {}
+        self.manual_power = {}
+        self.manual_water = {}
+        self.manual_widgets = []
+        # Callbacks 'after' pendientes por habitación (debounce de los sliders)
+        self._pending_after = {}
+
+        super().__init__(update_interval_ms)
+
+    def _build_window(self):
+        """
+        Crea el plano a la izquierda y el marco del panel de control a la derecha.
+        """
+        # Marco principal: plano a la izquierda, panel de control a la derecha
+        self.main_frame = tk.Frame(self.root, bg="white")
+        self.main_frame.pack(fill="both", expand=True)
+
+        # Canvas para el plano
+        self.canvas = tk.Canvas(self.main_frame, width=900, height=650, bg="white")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        # Panel lateral derecho para controles
+        self.control_frame = tk.Frame(self.main_frame, width=320, bg="white")
+        self.control_frame.pack(side="right", fill="y")
+
+    def _build_control_panel(self):
+        """
+        Construye el panel lateral derecho con:
+        - Selector de modo (automático / manual)
+        - Controles manuales por habitación (luces, temperatura, potencia, agua)
+        """
+        # Modo de simulación: "auto" o "manual"
+        self.mode = tk.StringVar(value="auto")
+        self.font_small = tkfont.Font(family="Helvetica", size=9)
+
+        # Selector de modo
+        mode_frame = tk.LabelFrame(
+            self.control_frame,
+            text="Modo de simulación",
+            bg="white",
+            font=self.font_info
+        )
+        mode_frame.pack(fill="x", padx=10, pady=(15, 5))
+
+        rb_auto = tk.Radiobutton(
+            mode_frame,
+            text="Automático",
+            variable=self.mode,
+            value="auto",
+            bg="white",
+            font=self.font_small,
+            command=self.on_mode_change
+        )
+        rb_manual = tk.Radiobutton(
+            mode_frame,
+            text="Manual",
+            variable=self.mode,
+            value="manual",
+            bg="white",
+            font=self.font_small,
+            command=self.on_mode_change
+        )
+        rb_auto.pack(anchor="w", padx=5, pady=2)
+        rb_manual.pack(anchor="w", padx=5, pady=2)
+
+        # No añadimos los radio buttons a manual_widgets porque deben seguir activos
+        # siempre para poder cambiar de modo.
+
+        # Separador visual
+        sep = tk.Frame(self.control_frame, height=2, bg="#cccccc")
+        sep.pack(fill="x", padx=10, pady=(5, 10))
+
+        # Controles por habitación
+        for room in ROOMS:
+            lf = tk.LabelFrame(
+                self.control_frame,
+                text=_ROOM_LABEL[room],
+                bg="white",
+                font=self.font_info
+            )
+            lf.pack(fill="x", padx=10, pady=5)
+            self.manual_widgets.append(lf)
+
+            # Luces
+            lights_var = tk.BooleanVar(value=False)
+            self.manual_lights[room] = lights_var
+            chk = tk.Checkbutton(
+                lf,
+                text="Luces encendidas",
+                variable=lights_var,
+                bg="white",
+                font=self.font_small,
+                command=lambda r=room: self._update_room_visual_from_manual(r)
+            )
+            chk.pack(anchor="w", padx=5, pady=(3, 6))
+            self.manual_widgets.append(chk)
+
+            # Temperatura
+            temp_var = tk.DoubleVar(value=21.0)
+            self.manual_temperature[room] = temp_var
+            tk.Label(
+                lf,
+                text="Temperatura (°C)",
+                bg="white",
+                font=self.font_small
+            ).pack(anchor="w", padx=5)
+            temp_scale = tk.Scale(
+                lf,
+                from_=15,
+                to=30,
+                orient="horizontal",
+                resolution=0.5,
+                variable=temp_var,
+                length=200,
+                command=lambda _val, r=room: self._schedule_manual(r),
+                bg="white"
+            )
+            temp_scale.pack(anchor="w", padx=5)
+            self.manual_widgets.append(temp_scale)
+
+            # Potencia
+            power_var = tk.DoubleVar(value=50.0)
+            self.manual_power[room] = power_var
+            tk.Label(
+                lf,
+                text="Potencia (W)",
+                bg="white",
+                font=self.font_small
+            ).pack(anchor="w", padx=5, pady=(5, 0))
+            power_scale = tk.Scale(
+                lf,
+                from_=0,
+                to=2000,
+                orient="horizontal",
+                resolution=10,
+                variable=power_var,
+                length=200,
+                command=lambda _val, r=room: self._schedule_manual(r),
+                bg="white"
+            )
+            power_scale.pack(anchor="w", padx=5)
+            self.manual_widgets.append(power_scale)
+
+            # Agua solo en cocina y baño
+            if room in ("cocina", "bano"):
+                water_var = tk.DoubleVar(value=0.0)
+                self.manual_water[room] = water_var
+                tk.Label(
+                    lf,
+                    text="Flujo de agua (L/min)",
+                    bg="white",
+                    font=self.font_small
+                ).pack(anchor="w", padx=5, pady=(5, 0))
+                water_scale = tk.Scale(
+                    lf,
+                    from_=0.0,
+                    to=15.0,
+                    orient="horizontal",
+                    resolution=0.5,
+                    variable=water_var,
+                    length=200,
+                    command=lambda _val, r=room: self._schedule_manual(r),
+                    bg="white"
+                )
+                water_scale.pack(anchor="w", padx=5, pady=(0, 5))
+                self.manual_widgets.append(water_scale)
+
+        # Al inicio, los controles manuales están deshabilitados porque el modo es "auto"
+        self._set_manual_controls_state(enabled=False)
+        for room in ROOMS:
+            self._manual_values[room] = self._read_manual(room)
+
+    def _set_manual_controls_state(self, enabled: bool):
+        """
+        Activa o desactiva todos los controles manuales (sliders, checkboxes).
+        Los radio buttons de modo quedan siempre activos.
+        """
+        state = "normal" if enabled else "disabled"
+        for widget in self.manual_widgets:
+            try:
+                widget.configure(state=state)
+            except tk.TclError:
+                # Algunos contenedores pueden no aceptar 'state'
+                pass
+
+    def _schedule_manual(self, room, delay_ms=50):
+        """
+        Programa el repintado de una habitación tras mover un slider.
+        Mientras se arrastra, cada evento cancela el anterior, de modo que
+        solo se pinta el último valor de cada ventana de delay_ms.
+        """
+        after_id = self._pending_after.pop(room, None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+
+        def fire():
+            self._pending_after.pop(room, None)
+            self._update_room_visual_from_manual(room)
+
+        self._pending_after[room] = self.root.after(delay_ms, fire)
+
+    def on_mode_change(self):
+        """
+        Callback al cambiar entre modo automático y manual.
+        """
+        manual = self.mode.get() == "manual"
+        self._manual_mode = manual
+        self._render_epoch += 1
+        self._set_manual_controls_state(enabled=manual)
+
+        # Si cambiamos a manual, actualizamos el plano inmediatamente
+        # (todas las habitaciones en el mismo repintado)
+        if manual:
+            self._dirty_manual.update(ROOMS)
+            self._schedule_render()
+
+    def _build_manual_readings(self, now: datetime):
+        """
+        Construye las lecturas a partir de los valores seleccionados manualmente
+        en la interfaz (la copia guardada en _manual_values).
+        """
+        readings = []
+        timestamp = int(now.timestamp())
+        manual_values = self._manual_values
+
+        for room in ROOMS:
+            temp, lights_on, power, water = manual_values[room]
+            readings.append(Reading(
+                timestamp=timestamp,
+                room=room,
+                temperature=temp,
+                lights_on=lights_on,
+                power_usage=power,
+                water_flow=water,
+            ))
+
+        return readings
+
+    def _simulate(self):
+        """
+        Lecturas de un ciclo: la simulación automática o los valores manuales.
+        """
+        if self._manual_mode:
+            return self._build_manual_readings(datetime.now())
+        return simulate_house_once()
+
+    def _collect_visuals(self):
+        """
+        Añade a las lecturas pendientes las habitaciones cambiadas a mano.
+        """
+        visuals = super()._collect_visuals()
+        for room in self._dirty_manual:
+            visuals[room] = self._manual_visual(room)
+        self._dirty_manual.clear()
+        return visuals
+
+    def _update_room_visual_from_manual(self, room):
+        """
+        Recoge los valores de los controles de una habitación tras un cambio
+        y, si el modo actual es 'manual', la repinta con ellos.
+        """
+        # Copia para el hilo de simulación: las lecturas manuales que van a
+        # InfluxDB no dependen de que se haya repintado
+        self._manual_values[room] = self._read_manual(room)
+        if self.mode.get() != "manual":
+            return
+
+        self._dirty_manual.add(room)
+        self._schedule_render()
+
+    def _read_manual(self, room):
+        """
+        Lee los valores de los controles de una habitación:
+        (temperatura, luces, potencia, agua).
+        """
+        temp = float(self.manual_temperature[room].get())
+        lights_on = 1 if self.manual_lights[room].get() else 0
+        power = float(self.manual_power[room].get())
+        if room in ("cocina", "bano"):
+            water = float(self.manual_water[room].get())
+        else:
+            water = 0.0
+        return temp, lights_on, power, water
+
+    def _manual_visual(self, room):
+        """
+        Calcula el aspecto de una habitación a partir de los valores manuales
+        (la copia en _manual_values), con el mismo formato que _room_visual.
+        """
+        rect_id = self.room_rects.get(room)
+        text_id = self.room_texts.get(room)
+        if rect_id is None or text_id is None:
+            return None
+
+        temp, lights_on, power, water = self._manual_values[room]
+
+        fill_color = temperature_to_color(temp)
+        outline_color = "gold" if lights_on else "black"
+
+        label = _ROOM_LABEL[room]
+        lights_str = "ON" if lights_on else "OFF"
+        lights_icon = "💡" if lights_on else "💤"
+
+        text = (
+            f"{label} {lights_icon}\n\n"
+            f"T: {temp:.1f} °C\n"
+            f"Luz: {lights_str}\n"
+            f"Potencia: {power:.0f} W\n"
+            f"Agua: {water:.1f} L/min"
+        )
+        return rect_id, fill_color, outline_color, text_id, text